@@ -2,20 +2,11 @@ import pandas as pd
 
 from app.load_reviews import load_and_clean_reviews
 
+PAYLOAD_COLUMNS = ["review_id", "review_text", "rating", "thumbs_up"]
 
-def build_review_payloads(df: pd.DataFrame) -> pd.DataFrame:
-    results = []
-
-    for _, row in df.iterrows():
-        payload = {
-            "review_id": row["review_id"],
-            "review_text": row["review_text"],
-            "rating": row["rating"],
-            "thumbs_up": row["thumbs_up"],
-        }
-        results.append(payload)
 
-    return pd.DataFrame(results)
+def build_review_payloads(df: pd.DataFrame) -> pd.DataFrame:
+    return df[PAYLOAD_COLUMNS].reset_index(drop=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from app.schema import CATEGORIES, URGENCIES
+
+CATEGORY_DTYPE = pd.CategoricalDtype(CATEGORIES)
+URGENCY_DTYPE = pd.CategoricalDtype(URGENCIES)
+
+
+def apply_result_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast category and urgency to categorical dtypes.
+
+    ReviewAnalysis only admits the known labels, so every value maps to a
+    category and nothing is rewritten or blanked by the cast.
+    """
+
+    return df.astype({"category": CATEGORY_DTYPE, "urgency": URGENCY_DTYPE})
+
+
+def observed_counts(series: pd.Series) -> pd.Series:
+    """value_counts() for a categorical column, skipping categories with no rows."""
+
+    return series.cat.remove_unused_categories().value_counts()
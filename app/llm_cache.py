@@ -0,0 +1,84 @@
+import hashlib
+import sqlite3
+from pathlib import Path
+
+CACHE_PATH = "data/cache/llm_cache.sqlite"
+
+# Stay under SQLite's default limit on bound parameters per statement
+MAX_QUERY_PARAMS = 500
+
+_conn: sqlite3.Connection | None = None
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+
+    if _conn is None:
+        Path(CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+
+    return _conn
+
+
+def make_key(fingerprint: str, payload: dict) -> str:
+    """
+    Hash everything that influences the model's answer for a review.
+
+    fingerprint covers the request settings (model, prompts, response
+    format); the payload adds the review's own fields.
+    """
+
+    raw = (
+        f"{fingerprint}|{payload['review_text']}"
+        f"|{payload['rating']}|{payload['thumbs_up']}"
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get(key: str) -> str | None:
+    row = (
+        _connect()
+        .execute("SELECT response FROM llm_cache WHERE key = ?", (key,))
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+def put(key: str, response: str) -> None:
+    conn = _connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response) VALUES (?, ?)",
+            (key, response),
+        )
+
+
+def get_many(keys: list[str]) -> dict[str, str]:
+    """Look up many keys with one query per chunk, returning only the hits."""
+
+    conn = _connect()
+    unique = list(dict.fromkeys(keys))
+    found = {}
+    for start in range(0, len(unique), MAX_QUERY_PARAMS):
+        chunk = unique[start : start + MAX_QUERY_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(
+            conn.execute(
+                f"SELECT key, response FROM llm_cache WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+        )
+    return found
+
+
+def put_many(entries: list[tuple[str, str]]) -> None:
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO llm_cache (key, response) VALUES (?, ?)",
+            entries,
+        )
@@ -1,53 +1,322 @@
+import asyncio
+import hashlib
 import json
+import os
+from collections import Counter
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+from pydantic import BaseModel, ValidationError
+from tqdm import tqdm
 
-from app.prompts import ANALYZE_REVIEW_PROMPT
-from app.schema import ReviewAnalysis
+from app import llm_cache
+from app.prompts import (
+    ANALYZE_REVIEW_PROMPT,
+    ANALYZE_REVIEWS_BATCH_PROMPT,
+    BATCH_REVIEW_ITEM,
+)
+from app.schema import ReviewAnalysis, ReviewAnalysisBatch
+
+# The OpenAI client retries rate limit, timeout and 5xx errors with
+# exponential backoff and jitter; a stalled request fails after 120s
+# instead of the SDK's 10 minute default.
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 120.0
+
+# Errors that can clear up on their own. Once retries are exhausted these
+# fail only the affected reviews; anything else (bad key, unknown model,
+# invalid request) would fail every review, so it stops the run instead.
+TRANSIENT_ERRORS = (
+    APIConnectionError,
+    APITimeoutError,
+    RateLimitError,
+    InternalServerError,
+)
+
+# Summary given to reviews that could not be analyzed
+FALLBACK_SUMMARY = "Analysis failed"
 
 load_dotenv()
-client = OpenAI()
 
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
+MAX_TOKENS_PER_REVIEW = int(os.getenv("OPENAI_MAX_TOKENS", "300"))
 
-def analyze_single_review(payload: dict) -> ReviewAnalysis:
-    prompt = ANALYZE_REVIEW_PROMPT.format(**payload)
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": "You analyze app reviews. Return only valid JSON.",
-            },
-            {"role": "user", "content": prompt},
+# Completion token limit of the model (gpt-4o-mini: 16,384). A batch
+# request asks for MAX_TOKENS_PER_REVIEW per review, so larger batches
+# would be rejected outright.
+MAX_OUTPUT_TOKENS = int(os.getenv("OPENAI_MAX_OUTPUT_TOKENS", "16384"))
+MAX_BATCH_SIZE = max(1, MAX_OUTPUT_TOKENS // MAX_TOKENS_PER_REVIEW)
+
+client = OpenAI(max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT)
+
+
+def _json_schema_format(model: type[BaseModel]) -> dict:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": model.model_json_schema()},
+    }
+
+
+# Request parts that never change between calls are built once at import
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You analyze app reviews. Return only valid JSON.",
+}
+REVIEW_RESPONSE_FORMAT = _json_schema_format(ReviewAnalysis)
+BATCH_RESPONSE_FORMAT = _json_schema_format(ReviewAnalysisBatch)
+
+# Fingerprint of every setting that shapes the answer apart from the review
+# itself, so changing the model, temperature, either prompt or the response
+# format never serves stale cache entries. Single and batch answers share
+# entries: both prompts apply the same rules and return the same schema.
+REQUEST_FINGERPRINT = hashlib.sha256(
+    json.dumps(
+        [
+            MODEL,
+            TEMPERATURE,
+            SYSTEM_MESSAGE,
+            ANALYZE_REVIEW_PROMPT,
+            ANALYZE_REVIEWS_BATCH_PROMPT,
+            BATCH_REVIEW_ITEM,
+            REVIEW_RESPONSE_FORMAT,
+            BATCH_RESPONSE_FORMAT,
         ],
-        temperature=0.2,
-        max_tokens=300,
+        sort_keys=True,
+    ).encode()
+).hexdigest()
+
+
+def _review_prompt(payload: dict) -> str:
+    return ANALYZE_REVIEW_PROMPT.format_map(payload)
+
+
+def _batch_prompt(payloads: list[dict]) -> str:
+    reviews = "\n".join(BATCH_REVIEW_ITEM.format_map(p) for p in payloads)
+    return ANALYZE_REVIEWS_BATCH_PROMPT.format(reviews=reviews)
+
+
+def _build_request(
+    prompt: str,
+    max_tokens: int = MAX_TOKENS_PER_REVIEW,
+    response_format: dict = REVIEW_RESPONSE_FORMAT,
+) -> dict:
+    return {
+        "model": MODEL,
+        "messages": [SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+        "temperature": TEMPERATURE,
+        "max_tokens": max_tokens,
+        "response_format": response_format,
+    }
+
+
+def _parse_analysis(content: str) -> ReviewAnalysis | None:
+    # Parse and validate in one pass; truncated replies or objects that
+    # do not match the schema both raise ValidationError.
+    try:
+        return ReviewAnalysis.model_validate_json(content)
+    except ValidationError:
+        return None
+
+
+def _parse_batch(content: str) -> dict[str, ReviewAnalysis]:
+    # Entries are validated one by one, so an entry with an unknown label
+    # only sends that review to a retry instead of the whole batch.
+    try:
+        entries = json.loads(content)["results"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    by_id = {}
+    for entry in entries:
+        try:
+            analysis = ReviewAnalysis.model_validate(entry)
+        except ValidationError:
+            continue
+        by_id[analysis.review_id] = analysis
+    return by_id
+
+
+def _fallback_analysis(payload: dict) -> ReviewAnalysis:
+    return ReviewAnalysis(
+        review_id=payload["review_id"],
+        category="other",
+        urgency="medium",
+        summary=FALLBACK_SUMMARY,
+        tags=[],
     )
 
-    content = response.choices[0].message.content.strip()
 
-    # Remove markdown if present
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-        content = content.strip()
+def _from_cache(cached: str, payload: dict) -> ReviewAnalysis:
+    # Identical reviews share a cache entry, so restore this review's id
+    analysis = ReviewAnalysis.model_validate_json(cached)
+    return analysis.model_copy(update={"review_id": str(payload["review_id"])})
+
+
+def _load_cached(key: str, payload: dict) -> ReviewAnalysis | None:
+    cached = llm_cache.get(key)
+    return None if cached is None else _from_cache(cached, payload)
+
+
+def _store_result(key: str, content: str, payload: dict) -> ReviewAnalysis:
+    analysis = _parse_analysis(content)
+
+    # Fallbacks are not cached so the review is retried on the next run
+    if analysis is None:
+        return _fallback_analysis(payload)
+
+    llm_cache.put(key, analysis.model_dump_json())
+    return analysis
+
+
+def analyze_single_review(payload: dict) -> ReviewAnalysis:
+    key = llm_cache.make_key(REQUEST_FINGERPRINT, payload)
+    cached = _load_cached(key, payload)
+    if cached is not None:
+        return cached
+
+    response = client.chat.completions.create(**_build_request(_review_prompt(payload)))
+    return _store_result(key, response.choices[0].message.content, payload)
+
+
+async def analyze_single_review_async(
+    aclient: AsyncOpenAI, payload: dict, semaphore: asyncio.Semaphore
+) -> ReviewAnalysis:
+    key = llm_cache.make_key(REQUEST_FINGERPRINT, payload)
+    cached = _load_cached(key, payload)
+    if cached is not None:
+        return cached
+
+    try:
+        async with semaphore:
+            response = await aclient.chat.completions.create(
+                **_build_request(_review_prompt(payload))
+            )
+    except TRANSIENT_ERRORS:
+        # Retries are exhausted; fail this review without aborting the batch
+        return _fallback_analysis(payload)
+
+    return _store_result(key, response.choices[0].message.content, payload)
+
+
+async def analyze_review_batch_async(
+    aclient: AsyncOpenAI, payloads: list[dict], semaphore: asyncio.Semaphore
+) -> list[ReviewAnalysis]:
+    """
+    Analyze several reviews with a single request.
+
+    Reviews missing from the reply or with an invalid entry, or all of them
+    if the request fails, are retried with one request per review.
+    """
+
+    if len(payloads) == 1:
+        return [await analyze_single_review_async(aclient, payloads[0], semaphore)]
+
+    ids = [str(p["review_id"]) for p in payloads]
 
-    # Parse JSON
     try:
-        data = json.loads(content)
-        return ReviewAnalysis(**data)
-    except:
-        # Fallback if parsing fails
-        return ReviewAnalysis(
-            review_id=payload["review_id"],
-            category="other",
-            urgency="medium",
-            summary="Analysis failed",
-            tags=[],
+        async with semaphore:
+            response = await aclient.chat.completions.create(
+                **_build_request(
+                    _batch_prompt(payloads),
+                    MAX_TOKENS_PER_REVIEW * len(payloads),
+                    BATCH_RESPONSE_FORMAT,
+                )
+            )
+    except TRANSIENT_ERRORS:
+        by_id = {}
+    else:
+        by_id = _parse_batch(response.choices[0].message.content)
+
+    # An id shared by several reviews in the batch cannot tell their
+    # answers apart, so those reviews are retried on their own
+    id_counts = Counter(ids)
+    results = [by_id.get(i) if id_counts[i] == 1 else None for i in ids]
+
+    # Cache the whole batch in one transaction
+    llm_cache.put_many(
+        [
+            (llm_cache.make_key(REQUEST_FINGERPRINT, p), analysis.model_dump_json())
+            for p, analysis in zip(payloads, results)
+            if analysis is not None
+        ]
+    )
+
+    missing = [i for i, analysis in enumerate(results) if analysis is None]
+    retried = await asyncio.gather(
+        *(analyze_single_review_async(aclient, payloads[i], semaphore) for i in missing)
+    )
+    for i, analysis in zip(missing, retried):
+        results[i] = analysis
+
+    return results
+
+
+async def analyze_reviews_async(
+    payloads: list[dict], concurrency: int = 32, batch_size: int = 10
+) -> list[ReviewAnalysis]:
+    """
+    Analyze reviews concurrently, returning results in payload order.
+
+    Cached reviews are looked up in one query and answered without a
+    request. The rest are sent `batch_size` reviews per request (capped at
+    MAX_BATCH_SIZE) with at most `concurrency` requests in flight, all
+    sharing one client and its connection pool.
+    """
+
+    keys = [llm_cache.make_key(REQUEST_FINGERPRINT, p) for p in payloads]
+    cached = llm_cache.get_many(keys)
+    results = [
+        _from_cache(cached[key], p) if key in cached else None
+        for key, p in zip(keys, payloads)
+    ]
+    pending = [i for i, analysis in enumerate(results) if analysis is None]
+
+    # Group reviews of similar length so a batch is not held up by one
+    # long review; results still land in their original slots
+    pending.sort(key=lambda i: len(payloads[i]["review_text"]))
+
+    # Keep each batch's output budget within the model's completion limit
+    batch_size = min(batch_size, MAX_BATCH_SIZE)
+    batches = [
+        pending[start : start + batch_size]
+        for start in range(0, len(pending), batch_size)
+    ]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    progress = tqdm(
+        total=len(payloads),
+        initial=len(payloads) - len(pending),
+        desc="Analyzing",
+        mininterval=0.5,
+        miniters=max(1, len(payloads) // 200),
+        smoothing=0,
+    )
+
+    async def run_batch(aclient: AsyncOpenAI, batch: list[int]):
+        analyses = await analyze_review_batch_async(
+            aclient, [payloads[i] for i in batch], semaphore
         )
+        for i, analysis in zip(batch, analyses):
+            results[i] = analysis
+        progress.update(len(batch))
+
+    with progress:
+        async with AsyncOpenAI(
+            max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT
+        ) as aclient:
+            await asyncio.gather(*(run_batch(aclient, batch) for batch in batches))
+
+    return results
 
 
 if __name__ == "__main__":
@@ -1,8 +1,19 @@
 import pandas as pd
 
+# Only the columns the pipeline uses; the input export carries many more
+REVIEW_COLUMNS = ["review_id", "review_text", "rating", "thumbs_up"]
+
+# rating and thumbs_up are left to inference so malformed values can be
+# coerced later instead of failing the read
+REVIEW_DTYPES = {"review_id": "string", "review_text": "string"}
+
 
 def load_and_clean_reviews(csv_path: str) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(
+        csv_path,
+        usecols=lambda column: column in REVIEW_COLUMNS,
+        dtype=REVIEW_DTYPES,
+    )
 
     if "review_text" not in df.columns:
         raise ValueError("CSV must contain 'review_text' column")
@@ -10,7 +21,10 @@ def load_and_clean_reviews(csv_path: str) -> pd.DataFrame:
     before = len(df)
 
     df = df.dropna(subset=["review_text"])
-    df = df.drop_duplicates(subset=["review_text"])
+
+    # Treat reviews differing only in case or surrounding whitespace as duplicates
+    normalized = df["review_text"].str.strip().str.casefold()
+    df = df.loc[~normalized.duplicated()]
 
     after = len(df)
     print(f"Reviews cleaned: {before} → {after}")
@@ -1,13 +1,19 @@
+import numpy as np
 import pandas as pd
 
+from app.dtypes import URGENCY_DTYPE
 
-def add_priority_score(
-    results_df: pd.DataFrame, payload_df: pd.DataFrame
-) -> pd.DataFrame:
+# Weights indexed by urgency category code (low, medium, high). The trailing
+# entry is picked up by code -1, i.e. missing or unknown urgency.
+URGENCY_WEIGHTS = np.array([10.0, 50.0, 100.0, 10.0])
+
+
+def add_priority_score(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add priority_score column based on urgency, rating, and thumbs_up.
 
-    Merges rating and thumbs_up from payload_df into results_df.
+    Expects the rating and thumbs_up columns carried through by
+    run_llm_batch; the score is added to df in place.
 
     Formula:
     - urgency_weight: high=100, medium=50, low=10
@@ -16,23 +22,16 @@ def add_priority_score(
     - priority_score = urgency_weight + rating_penalty + thumbs_bonus
     """
 
-    # Merge rating and thumbs_up from payloads
-    df = results_df.merge(
-        payload_df[["review_id", "rating", "thumbs_up"]],
-        on="review_id",
-        how="left",
-    )
-
     # --- FIX: ensure numeric and handle missing values ---
     df["rating"] = pd.to_numeric(df["rating"], errors="coerce").fillna(3)
     df["thumbs_up"] = pd.to_numeric(df["thumbs_up"], errors="coerce").fillna(0)
 
-    urgency_weights = {"high": 100, "medium": 50, "low": 10}
+    urgency_codes = df["urgency"].astype(URGENCY_DTYPE).cat.codes.to_numpy()
+    rating = df["rating"].to_numpy(dtype=np.float64)
+    thumbs_up = df["thumbs_up"].to_numpy(dtype=np.float64)
 
     df["priority_score"] = (
-        df["urgency"].map(urgency_weights).fillna(10)
-        + (5 - df["rating"]) * 10
-        + df["thumbs_up"].clip(upper=50)
+        URGENCY_WEIGHTS[urgency_codes] + (5 - rating) * 10 + np.minimum(thumbs_up, 50)
     )
 
     return df
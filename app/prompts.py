@@ -1,24 +1,4 @@
-ANALYZE_REVIEW_PROMPT = """
-You are an expert product analyst for mobile apps.
-
-Analyze the following app review and return ONLY a valid JSON object.
-Do NOT include markdown, explanations, or extra text.
-
-Review context:
-- Review ID: {review_id}
-- Review Text: "{review_text}"
-- Rating: {rating}/5
-- Thumbs Up: {thumbs_up}
-
-Return a JSON object with EXACTLY these fields:
-{{
-  "review_id": "{review_id}",
-  "category": "bug|payment|ads|performance|feature_request|praise|complaint|other",
-  "urgency": "low|medium|high",
-  "summary": "one concise sentence",
-  "tags": ["tag1", "tag2"]
-}}
-
+ANALYSIS_RULES = """
 Category rules (apply in this priority order):
 1. bug → crashes, errors, broken or unusable features
 2. payment → payment failures, refunds, pricing issues
@@ -50,3 +30,54 @@ IMPORTANT:
 - Do NOT omit any field
 - Do NOT add extra keys
 """
+
+ANALYZE_REVIEW_PROMPT = """
+You are an expert product analyst for mobile apps.
+
+Analyze the following app review and return ONLY a valid JSON object.
+Do NOT include markdown, explanations, or extra text.
+
+Review context:
+- Review ID: {review_id}
+- Review Text: "{review_text}"
+- Rating: {rating}/5
+- Thumbs Up: {thumbs_up}
+
+Return a JSON object with EXACTLY these fields:
+{{
+  "review_id": "{review_id}",
+  "category": "bug|payment|ads|performance|feature_request|praise|complaint|other",
+  "urgency": "low|medium|high",
+  "summary": "one concise sentence",
+  "tags": ["tag1", "tag2"]
+}}
+""" + ANALYSIS_RULES
+
+ANALYZE_REVIEWS_BATCH_PROMPT = """
+You are an expert product analyst for mobile apps.
+
+Analyze each of the following app reviews and return ONLY a valid JSON object.
+Do NOT include markdown, explanations, or extra text.
+
+Reviews:
+{reviews}
+
+Return a JSON object with a "results" array holding exactly one entry per
+review, in the same order, each with EXACTLY these fields:
+{{
+  "results": [
+    {{
+      "review_id": "the review's ID",
+      "category": "bug|payment|ads|performance|feature_request|praise|complaint|other",
+      "urgency": "low|medium|high",
+      "summary": "one concise sentence",
+      "tags": ["tag1", "tag2"]
+    }}
+  ]
+}}
+""" + ANALYSIS_RULES
+
+BATCH_REVIEW_ITEM = """- Review ID: {review_id}
+  Review Text: "{review_text}"
+  Rating: {rating}/5
+  Thumbs Up: {thumbs_up}"""
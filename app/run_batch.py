@@ -1,14 +1,53 @@
+import asyncio
+import os
+
 import pandas as pd
-from tqdm import tqdm
 
-from app.llm_client import analyze_single_review
+from app.dtypes import apply_result_dtypes
+from app.llm_client import FALLBACK_SUMMARY, analyze_reviews_async
+from app.schema import ReviewAnalysis
+
+
+def _positive_int_env(name: str, default: int) -> int:
+    value = int(os.getenv(name, str(default)))
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value}")
+    return value
+
+
+# Maximum number of LLM requests in flight at once
+LLM_CONCURRENCY = _positive_int_env("LLM_CONCURRENCY", 32)
+
+# Number of reviews sent to the LLM in a single request
+LLM_BATCH_SIZE = _positive_int_env("LLM_BATCH_SIZE", 10)
+
+# Payload columns kept alongside the analysis for priority scoring
+SCORING_COLUMNS = ["rating", "thumbs_up"]
+
+
+def run_llm_batch(
+    payload_df: pd.DataFrame,
+    concurrency: int = LLM_CONCURRENCY,
+    batch_size: int = LLM_BATCH_SIZE,
+) -> pd.DataFrame:
+    payloads = payload_df.to_dict(orient="records")
+    analyses = asyncio.run(analyze_reviews_async(payloads, concurrency, batch_size))
+
+    # Build one list per field rather than a dict per review, so pandas
+    # wraps the columns directly instead of matching keys row by row
+    columns = {
+        field: [getattr(analysis, field) for analysis in analyses]
+        for field in ReviewAnalysis.model_fields
+    }
 
+    # Results come back in payload order, so the scoring inputs are
+    # carried over by position instead of merged back on review_id
+    for column in SCORING_COLUMNS:
+        columns[column] = payload_df[column].to_numpy()
 
-def run_llm_batch(payload_df: pd.DataFrame) -> pd.DataFrame:
-    results = []
+    results_df = pd.DataFrame(columns, copy=False)
 
-    for _, row in tqdm(payload_df.iterrows(), total=len(payload_df), desc="Analyzing"):
-        analysis = analyze_single_review(row.to_dict())
-        results.append(analysis.model_dump())
+    failed_count = sum(summary == FALLBACK_SUMMARY for summary in columns["summary"])
+    print(f"{failed_count} of {len(analyses)} reviews could not be analyzed")
 
-    return pd.DataFrame(results)
+    return apply_result_dtypes(results_df)
@@ -1,11 +1,38 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+CATEGORIES = [
+    "bug",
+    "payment",
+    "ads",
+    "performance",
+    "feature_request",
+    "praise",
+    "complaint",
+    "other",
+]
+URGENCIES = ["low", "medium", "high"]
 
 
 class ReviewAnalysis(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     review_id: str
-    category: (
-        str  # bug, payment, ads, performance, feature_request, praise, complaint, other
-    )
-    urgency: str  # low, medium, high
+    # Literals become enums in the json_schema response format
+    category: Literal[tuple(CATEGORIES)]
+    urgency: Literal[tuple(URGENCIES)]
     summary: str
     tags: list[str]
+
+    @field_validator("category", "urgency", mode="before")
+    @classmethod
+    def _normalize_label(cls, value):
+        # Accept "High" or "bug " as the labels they clearly mean
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class ReviewAnalysisBatch(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    results: list[ReviewAnalysis]
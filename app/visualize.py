@@ -1,14 +1,87 @@
+import html
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
+from matplotlib.figure import Figure
 
+from app.dtypes import observed_counts
 
-def save_top_urgent(df: pd.DataFrame, output_path: str):
-    """Save top 10 urgent reviews sorted by priority_score."""
+URGENCY_COLORS = {"high": "#d32f2f", "medium": "#ff9800", "low": "#9e9e9e"}
 
-    top_10 = df.nlargest(10, "priority_score")[
+# Low zlib effort: charts encode several times faster for slightly larger files
+SAVE_KWARGS = {"dpi": 150, "pil_kwargs": {"compress_level": 1}}
+
+
+def _plot_bars(ax, series: pd.Series, color, rotation: int = 45):
+    """Draw a bar chart directly, without pandas' plotting layer."""
+
+    positions = np.arange(len(series))
+    ax.bar(positions, series.to_numpy(), width=0.5, color=color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(
+        series.index.astype(str),
+        rotation=rotation,
+        ha="right" if rotation else "center",
+    )
+
+
+URGENT_TABLE_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Top 10 Urgent Issues</title>
+<style>
+  body {{ font-family: sans-serif; margin: 24px; }}
+  h1 {{ font-size: 20px; }}
+  table {{ border-collapse: collapse; width: 100%; font-size: 14px; }}
+  th {{ background: #1976d2; color: white; text-align: left; padding: 8px; }}
+  td {{ border-bottom: 1px solid #ddd; padding: 8px; }}
+  td.urgency {{ color: white; font-weight: bold; }}
+</style>
+</head>
+<body>
+<h1>Top 10 Urgent Issues (Action Required)</h1>
+<table>
+<tr><th>Category</th><th>Urgency</th><th>Priority</th><th>Summary</th></tr>
+{rows}
+</table>
+</body>
+</html>
+"""
+
+URGENT_TABLE_ROW = (
+    "<tr><td>{category}</td>"
+    '<td class="urgency" style="background: {color}">{urgency}</td>'
+    "<td>{priority:g}</td><td>{summary}</td></tr>"
+)
+
+
+def save_urgent_table_html(top_df: pd.DataFrame, output_path: str):
+    """Write the top urgent reviews as a standalone HTML table."""
+
+    rows = "\n".join(
+        URGENT_TABLE_ROW.format(
+            category=html.escape(str(category)),
+            color=URGENCY_COLORS.get(urgency, "#9e9e9e"),
+            urgency=html.escape(str(urgency)),
+            priority=priority,
+            summary=html.escape(str(summary)),
+        )
+        for category, urgency, priority, summary in top_df[
+            ["category", "urgency", "priority_score", "summary"]
+        ].itertuples(index=False, name=None)
+    )
+
+    Path(output_path).write_text(URGENT_TABLE_HTML.format(rows=rows), encoding="utf-8")
+
+
+def save_top_urgent(top_df: pd.DataFrame, output_path: str):
+    """Save top urgent reviews, already sorted by priority_score."""
+
+    top_10 = top_df[
         [
             "review_id",
             "category",
@@ -24,75 +97,70 @@ def save_top_urgent(df: pd.DataFrame, output_path: str):
     print(f"✅ Top 10 urgent saved: {output_path}")
 
 
-def create_charts(df: pd.DataFrame, output_dir: str):
-    """Create visualization suite for product/QA reporting."""
-
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-    urgency_colors = {"high": "#d32f2f", "medium": "#ff9800", "low": "#9e9e9e"}
-
-    # Category distribution
-    category_counts = df["category"].value_counts()
-    plt.figure(figsize=(10, 6))
-    category_counts.plot(kind="bar", color="#1976d2")
-    plt.title("Review Volume by Category", fontsize=14, fontweight="bold")
-    plt.xlabel("Category")
-    plt.ylabel("Number of Reviews")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/category_distribution.png", dpi=150)
-    plt.close()
-
-    # Urgency distribution
-    urgency_counts = df["urgency"].value_counts()
-    urgency_order = ["high", "medium", "low"]
-    urgency_counts = urgency_counts.reindex(urgency_order, fill_value=0)
-
-    plt.figure(figsize=(8, 6))
-    colors = [urgency_colors.get(u, "#9e9e9e") for u in urgency_counts.index]
-    urgency_counts.plot(kind="bar", color=colors)
-    plt.title("Urgency Distribution", fontsize=14, fontweight="bold")
-    plt.xlabel("Urgency Level")
-    plt.ylabel("Number of Reviews")
-    plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/urgency_distribution.png", dpi=150)
-    plt.close()
-
-    # Priority-weighted category chart
-    priority_by_category = (
-        df.groupby("category")["priority_score"].sum().sort_values(ascending=False)
+def _priority_by_category(df: pd.DataFrame) -> pd.Series:
+    # Sum scores per category code directly; unobserved categories are dropped
+    # to match a groupby with observed=True
+    codes = df["category"].cat.codes.to_numpy()
+    observed = codes >= 0
+    categories = df["category"].cat.categories
+    totals = np.bincount(
+        codes[observed],
+        weights=df["priority_score"].to_numpy(dtype=np.float64)[observed],
+        minlength=len(categories),
     )
-
-    plt.figure(figsize=(12, 6))
-    ax = priority_by_category.plot(kind="bar", color="#e65100")
-    plt.title(
+    counts = np.bincount(codes[observed], minlength=len(categories))
+    return pd.Series(totals, index=categories)[counts > 0].sort_values(ascending=False)
+
+
+# Each renderer builds its own Figure through the object-oriented API rather
+# than pyplot, so the charts can be drawn and encoded on separate threads.
+
+
+def _render_category_distribution(category_counts: pd.Series, output_path: str):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    _plot_bars(ax, category_counts, "#1976d2")
+    ax.set_title("Review Volume by Category", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Category")
+    ax.set_ylabel("Number of Reviews")
+    fig.tight_layout()
+    fig.savefig(output_path, **SAVE_KWARGS)
+
+
+def _render_urgency_distribution(urgency_counts: pd.Series, output_path: str):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    colors = [URGENCY_COLORS.get(u, "#9e9e9e") for u in urgency_counts.index]
+    _plot_bars(ax, urgency_counts, colors, rotation=0)
+    ax.set_title("Urgency Distribution", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Urgency Level")
+    ax.set_ylabel("Number of Reviews")
+    fig.tight_layout()
+    fig.savefig(output_path, **SAVE_KWARGS)
+
+
+def _render_priority_by_category(priority_by_category: pd.Series, output_path: str):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.add_subplot()
+    _plot_bars(ax, priority_by_category, "#e65100")
+    ax.set_title(
         "High Impact Issues by Category (Priority-weighted)",
         fontsize=14,
         fontweight="bold",
     )
-    plt.xlabel("Category")
-    plt.ylabel("Total Priority Score")
-    plt.xticks(rotation=45, ha="right")
+    ax.set_xlabel("Category")
+    ax.set_ylabel("Total Priority Score")
 
     for i, v in enumerate(priority_by_category):
         ax.text(i, v + 5, str(int(v)), ha="center", va="bottom", fontsize=9)
 
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/priority_weighted_category.png", dpi=150)
-    plt.close()
-
-    # Urgency × Category heatmap
-    heatmap_data = df.pivot_table(
-        index="urgency",
-        columns="category",
-        values="review_id",
-        aggfunc="count",
-        fill_value=0,
-    )
-    heatmap_data = heatmap_data.reindex(["high", "medium", "low"], fill_value=0)
+    fig.tight_layout()
+    fig.savefig(output_path, **SAVE_KWARGS)
 
-    plt.figure(figsize=(12, 5))
+
+def _render_heatmap(heatmap_data: pd.DataFrame, output_path: str):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.add_subplot()
     sns.heatmap(
         heatmap_data,
         annot=True,
@@ -100,53 +168,60 @@ def create_charts(df: pd.DataFrame, output_dir: str):
         cmap="YlOrRd",
         linewidths=0.5,
         cbar_kws={"label": "Review Count"},
+        ax=ax,
     )
-    plt.title("Issue Distribution: Urgency × Category", fontsize=14, fontweight="bold")
-    plt.xlabel("Category")
-    plt.ylabel("Urgency Level")
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/urgency_category_heatmap.png", dpi=150)
-    plt.close()
-
-    # Top 10 urgent issues table
-    top_10 = df.nlargest(10, "priority_score")[
-        ["category", "urgency", "priority_score", "summary"]
-    ].copy()
-    top_10["summary"] = top_10["summary"].str[:60] + "..."
-
-    fig, ax = plt.subplots(figsize=(14, 6))
-    ax.axis("tight")
-    ax.axis("off")
-
-    row_colors = [urgency_colors.get(u, "#ffffff") for u in top_10["urgency"]]
-
-    table = ax.table(
-        cellText=top_10.values,
-        colLabels=["Category", "Urgency", "Priority", "Summary"],
-        cellLoc="left",
-        loc="center",
-        colWidths=[0.15, 0.12, 0.12, 0.61],
-        rowColours=row_colors,
+    ax.set_title(
+        "Issue Distribution: Urgency × Category", fontsize=14, fontweight="bold"
     )
+    ax.set_xlabel("Category")
+    ax.set_ylabel("Urgency Level")
+    fig.tight_layout()
+    fig.savefig(output_path, **SAVE_KWARGS)
+
+
+def create_charts(df: pd.DataFrame, top_df: pd.DataFrame, output_dir: str):
+    """
+    Create visualization suite for product/QA reporting.
 
-    table.auto_set_font_size(False)
-    table.set_fontsize(9)
-    table.scale(1, 2)
+    top_df holds the top urgent reviews, already sorted by priority_score.
+    Aggregates are computed up front; the independent charts are then
+    rendered concurrently.
+    """
 
-    for i in range(4):
-        table[(0, i)].set_facecolor("#1976d2")
-        table[(0, i)].set_text_props(weight="bold", color="white")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    plt.title(
-        "Top 10 Urgent Issues (Action Required)", fontsize=14, fontweight="bold", pad=20
+    category_counts = observed_counts(df["category"])
+    urgency_counts = (
+        df["urgency"].value_counts().reindex(["high", "medium", "low"], fill_value=0)
+    )
+    priority_by_category = _priority_by_category(df)
+    heatmap_data = (
+        df.groupby(["urgency", "category"], observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(["high", "medium", "low"], fill_value=0)
     )
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/top_urgent_table.png", dpi=150, bbox_inches="tight")
-    plt.close()
+
+    jobs = [
+        (_render_category_distribution, category_counts, "category_distribution.png"),
+        (_render_urgency_distribution, urgency_counts, "urgency_distribution.png"),
+        (
+            _render_priority_by_category,
+            priority_by_category,
+            "priority_weighted_category.png",
+        ),
+        (_render_heatmap, heatmap_data, "urgency_category_heatmap.png"),
+        (save_urgent_table_html, top_df, "top_urgent_table.html"),
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [
+            executor.submit(render, data, f"{output_dir}/{filename}")
+            for render, data, filename in jobs
+        ]
+        for future in futures:
+            future.result()
 
     print(f"Charts saved: {output_dir}/")
-    print(f"   - category_distribution.png")
-    print(f"   - urgency_distribution.png")
-    print(f"   - priority_weighted_category.png")
-    print(f"   - urgency_category_heatmap.png")
-    print(f"   - top_urgent_table.png")
+    for _, _, filename in jobs:
+        print(f"   - {filename}")
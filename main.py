@@ -1,11 +1,47 @@
-from app.analyze_reviews import build_review_payloads
-from app.load_reviews import load_and_clean_reviews
-from app.priority import add_priority_score
-from app.run_batch import run_llm_batch
-from app.visualize import create_charts, save_top_urgent
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+OUTPUT_DIR = "data/output"
+CHARTS_DIR = f"{OUTPUT_DIR}/charts"
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args() -> argparse.Namespace:
+    # Unset LLM flags stay None so run_llm_batch falls back to the
+    # LLM_CONCURRENCY / LLM_BATCH_SIZE environment settings
+    parser = argparse.ArgumentParser(description="Game Review Analyzer Pipeline")
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        help="maximum LLM requests in flight at once (default: $LLM_CONCURRENCY or 32)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        help="reviews sent to the LLM per request (default: $LLM_BATCH_SIZE or 10)",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
+    # Imported after argument parsing so --help and bad flags return
+    # without loading pandas, the OpenAI SDK and matplotlib
+    from app.analyze_reviews import build_review_payloads
+    from app.dtypes import observed_counts
+    from app.load_reviews import load_and_clean_reviews
+    from app.priority import add_priority_score
+    from app.run_batch import run_llm_batch
+    from app.visualize import create_charts, save_top_urgent
+
     print("\nGame Review Analyzer Pipeline\n")
 
     # Step 1: Load
@@ -20,32 +56,50 @@ def main():
 
     # Step 3: Analyze with AI
     print("[3/3] Running AI analysis...")
-    results_df = run_llm_batch(payload_df)
+    llm_options = {
+        "concurrency": args.concurrency,
+        "batch_size": args.batch_size,
+    }
+    results_df = run_llm_batch(
+        payload_df,
+        **{name: value for name, value in llm_options.items() if value is not None},
+    )
 
-    # Phase 2: Add priority scoring (pass payload_df for rating/thumbs_up)
+    # Phase 2: Add priority scoring (rating/thumbs_up come with the results)
     print("\n[Phase 2] Adding priority scores...")
-    results_df = add_priority_score(results_df, payload_df)
+    results_df = add_priority_score(results_df)
+
+    # Rank once; the CSV export, the table chart and the preview share it
+    top_df = results_df.nlargest(10, "priority_score")
+
+    # One call creates the whole output tree before any writer starts, so
+    # the background CSV writes never race a missing directory
+    Path(CHARTS_DIR).mkdir(parents=True, exist_ok=True)
 
-    # Save main results
-    results_df.to_csv("data/output/results.csv", index=False)
-    print(f"Results saved: data/output/results.csv")
+    # Write the CSVs in the background while the charts render
+    with ThreadPoolExecutor() as executor:
+        saves = [
+            executor.submit(
+                results_df.to_csv, f"{OUTPUT_DIR}/results.csv", index=False
+            ),
+            executor.submit(save_top_urgent, top_df, f"{OUTPUT_DIR}/top_urgent.csv"),
+        ]
 
-    # Save top urgent
-    save_top_urgent(results_df, "data/output/top_urgent.csv")
+        # Create visualizations
+        create_charts(results_df, top_df, CHARTS_DIR)
 
-    # Create visualizations
-    create_charts(results_df, "data/output/charts")
+        for save in saves:
+            save.result()
+    print(f"Results saved: {OUTPUT_DIR}/results.csv")
 
     # Show summary
     print(f"\nSummary:")
-    print(f"Categories: {results_df['category'].value_counts().to_dict()}")
-    print(f"Urgency: {results_df['urgency'].value_counts().to_dict()}")
+    print(f"Categories: {observed_counts(results_df['category']).to_dict()}")
+    print(f"Urgency: {observed_counts(results_df['urgency']).to_dict()}")
 
     # Show top 3 urgent (preview)
     print(f"\nTop 3 Urgent Reviews:")
-    top_3 = results_df.nlargest(3, "priority_score")[
-        ["review_id", "priority_score", "urgency", "summary"]
-    ]
+    top_3 = top_df.head(3)[["review_id", "priority_score", "urgency", "summary"]]
     print(top_3.to_string(index=False))
 
 